@@ -5,8 +5,8 @@ A self-contained logging library that can be easily copied into any project.
 Provides configurable logging with multiple output formats and levels.
 """
 
-from .logger import LogLevel
-from .registry import get_logger, close_all_loggers
+from .logger import LogLevel, DEBUG, INFO, WARNING, ERROR, CRITICAL
+from .registry import get_logger, close_all_loggers, set_current_logger, current_logger
 
 __version__ = "1.0.0"
 __author__ = "Robin Jüngerich"
@@ -14,14 +14,29 @@ __author__ = "Robin Jüngerich"
 # Public API - only these should be used from outside the Logger folder
 __all__ = [
     'LogLevel',
+    'DEBUG',
+    'INFO',
+    'WARNING',
+    'ERROR',
+    'CRITICAL',
     'get_logger',
     'close_all_loggers',
+    'set_current_logger',
+    'current_logger',
     'create_logger'
 ]
 
 # Convenience function to create a default logger
-def create_logger(name="default", level=LogLevel.INFO):
-    """Create a default logger with console output."""
+def create_logger(name="default", level=LogLevel.INFO, async_=False, handler="file"):
+    """
+    Create a default logger with console output.
+    
+    With async_=True, handlers run on a background thread and logging calls
+    only queue the record; close_all_loggers() waits for the queue to drain.
+    handler selects how the log file is written: "file", "mmap" or "uring".
+    """
     from .config import setup_basic_logger
-    logger = setup_basic_logger(name, level)
+    logger = setup_basic_logger(name, level, handler=handler)
+    if async_:
+        logger.set_async_dispatch(True)
     return logger 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Asynchronous handler that moves log output off the calling thread.
+"""
+
+import atexit
+import queue
+import sys
+import threading
+import weakref
+
+from .handlers import Handler
+
+
+# Most records the listener takes from the queue per wake-up
+BATCH_SIZE = 256
+
+
+class AsyncHandler(Handler):
+    """Handler that queues records and emits them to target handlers on a background thread."""
+    
+    # Queued records outlive the emit() call
+    retains_records = True
+    
+    def __init__(self, targets, max_queue_size=10000, drop_on_full=False):
+        """
+        Args:
+            targets: Handlers that receive the records on the background thread
+            max_queue_size: Maximum number of records waiting to be emitted
+            drop_on_full: Drop records when the queue is full instead of writing them to stderr
+        """
+        super().__init__()
+        self.targets = list(targets)
+        self.drop_on_full = drop_on_full
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._listen, name="AsyncHandler", daemon=True)
+        self._thread.start()
+        _live_async_handlers.add(self)
+        
+    def emit(self, record):
+        """Queue the record for the background thread."""
+        if self._closed:
+            # No listener any more, so emit on the calling thread
+            self._emit_to_targets(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if self.drop_on_full:
+                self.dropped += 1
+            else:
+                # Keep the record visible rather than blocking the caller
+                sys.stderr.write(self.format(record) + '\n')
+                
+    def _emit_to_targets(self, record):
+        """Emit a record to every target handler."""
+        self._emit_batch_to_targets([record])
+        
+    def _emit_batch_to_targets(self, records):
+        """Emit a list of records to every target handler."""
+        for handler in self.targets:
+            min_level = getattr(handler, '_min_level_value', -1)
+            batch = records if min_level < 0 else [r for r in records if r.levelno >= min_level]
+            if not batch:
+                continue
+            try:
+                emit_batch = getattr(handler, 'emit_batch', None)
+                if emit_batch is not None:
+                    emit_batch(batch)
+                else:
+                    for record in batch:
+                        handler.emit(record)
+            except Exception as e:
+                # Prevent infinite recursion if handler fails
+                sys.stderr.write(f"Handler error: {e}\n")
+                
+    def _listen(self):
+        """Background loop emitting queued records until the None sentinel arrives."""
+        while True:
+            # Block for one record, then take whatever else is already queued
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                records = batch
+                if None in batch:
+                    records = batch[:batch.index(None)]
+                if records:
+                    self._emit_batch_to_targets(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if records is not batch:
+                return
+                
+    def flush(self):
+        """Wait until all queued records are emitted, then flush the targets."""
+        if not self._closed:
+            self._queue.join()
+        for handler in self.targets:
+            if hasattr(handler, 'flush'):
+                handler.flush()
+                
+    def _stop(self, timeout=None):
+        """Emit all queued records and stop the background thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+                
+    def close(self):
+        """Emit all queued records, stop the background thread and close the targets."""
+        self._stop()
+        for handler in self.targets:
+            if hasattr(handler, 'close'):
+                handler.close()
+
+
+# Async handlers still alive, so their queues can be drained at exit
+_live_async_handlers = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_async_handlers():
+    """Drain every live AsyncHandler's queue at interpreter shutdown."""
+    # Registered after handlers.py's hook, so this runs first and the
+    # file handlers still get to flush what the listeners wrote
+    for handler in list(_live_async_handlers):
+        try:
+            handler._stop(timeout=1.0)
+        except Exception as e:
+            sys.stderr.write(f"Handler error: {e}\n")
@@ -8,6 +8,9 @@ from .logger import Logger, LogLevel
 from .formatters import SimpleFormatter, JSONFormatter, ColoredFormatter
 from .handlers import ConsoleHandler, FileHandler, RotatingFileHandler
 from .registry import register_logger
+from .async_handler import AsyncHandler
+from .mmap_handler import MmapFileHandler
+from .uring_handler import UringFileHandler
 
 # Get the absolute path to the Logger/logs directory
 _LOGGER_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -33,8 +36,15 @@ def _abs_log_path(filename, name=None):
         filename = os.path.join(_LOGS_DIR, filename)
     return filename
 
+# File handler classes selectable by name in setup_basic_logger()
+_FILE_HANDLERS = {
+    "file": FileHandler,
+    "mmap": MmapFileHandler,
+    "uring": UringFileHandler,
+}
+
 def setup_basic_logger(name="default", level=LogLevel.INFO, 
-                      console=True, file=None, colored=True):
+                      console=True, file=None, colored=True, handler="file"):
     """
     Setup a basic logger with common configuration.
     
@@ -44,7 +54,10 @@ def setup_basic_logger(name="default", level=LogLevel.INFO,
         console: Whether to output to console
         file: Optional file path for file output (defaults to logs/{timestamp}-{name}.log)
         colored: Whether to use colored output (console only)
+        handler: How the log file is written: "file", "mmap" or "uring"
     """
+    if handler not in _FILE_HANDLERS:
+        raise ValueError(f"Unknown file handler: {handler}")
     logger = Logger(name)
     logger.set_level(level)
     
@@ -60,7 +73,7 @@ def setup_basic_logger(name="default", level=LogLevel.INFO,
     # File handler
     file = _abs_log_path(file, name)
     if file:
-        file_handler = FileHandler(file)
+        file_handler = _FILE_HANDLERS[handler](file)
         file_handler.set_formatter(SimpleFormatter())
         logger.add_handler(file_handler)
     
@@ -95,6 +108,23 @@ def setup_production_logger(name="default", log_file="app.log"):
     )
 
 
+def setup_async_logger(name="default", log_file="app.log", level=LogLevel.INFO):
+    """
+    Setup a logger whose file output is written on a background thread.
+    """
+    logger = Logger(name)
+    logger.set_level(level)
+    log_file = _abs_log_path(log_file, name)
+    file_handler = FileHandler(log_file)
+    file_handler.set_formatter(SimpleFormatter())
+    logger.add_handler(AsyncHandler([file_handler]))
+    
+    # Register the logger
+    register_logger(name, logger)
+    
+    return logger
+
+
 def setup_json_logger(name="default", log_file="app.json.log"):
     """
     Setup a logger that outputs JSON format (useful for log aggregation).
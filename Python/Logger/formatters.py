@@ -2,19 +2,142 @@
 Log formatters that convert LogRecord objects into formatted strings.
 """
 
-from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict
 import json
+import os
+import string
 
+from .logger import LogLevel
 
-class Formatter(ABC):
-    """Abstract base class for log formatters."""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_json_dumps(data: Dict[str, Any]) -> str:
+    """Serialize with the standard library json module, compact like orjson."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+if orjson is not None:
+    def _json_dumps(data: Dict[str, Any]) -> str:
+        """Serialize with orjson, which runs entirely in C, and json for what it rejects."""
+        for value in data.values():
+            # orjson would write NaN and infinity as null; json keeps them
+            if value.__class__ is float and value - value != 0:
+                return _stdlib_json_dumps(data)
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except (orjson.JSONEncodeError, TypeError):
+            # e.g. integers beyond 64 bits
+            return _stdlib_json_dumps(data)
+else:
+    _json_dumps = _stdlib_json_dumps
+
+
+# Last rendered timestamp per date format: {date_format: (epoch_second, text)}
+_TS_CACHE: Dict[str, tuple] = {}
+_ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _format_timestamp(created: float, date_format: str) -> str:
+    """Render an epoch timestamp, reusing the previous result within the same second."""
+    second = int(created)
+    cached = _TS_CACHE.get(date_format)
+    if cached is not None and cached[0] == second:
+        return cached[1]
+    if '%f' in date_format:
+        return _format_subsecond(created, date_format)
+    text = datetime.fromtimestamp(created).strftime(date_format)
+    _TS_CACHE[date_format] = (second, text)
+    return text
+
+
+def _format_subsecond(created: float, date_format: str) -> str:
+    """Render a format with %f from the cached text around it plus the microseconds."""
+    head, _, tail = date_format.partition('%f')
+    # Only a single %f with no directives or escapes after it can be split off
+    if '%' in tail or '%%' in date_format:
+        return datetime.fromtimestamp(created).strftime(date_format)
+    second, microsecond = _split_seconds(created)
+    return f"{_format_timestamp(second, head)}{microsecond:06d}{tail}"
+
+
+def _split_seconds(created: float) -> tuple:
+    """Split an epoch time into whole seconds and microseconds the way datetime.fromtimestamp does."""
+    # Rounded like datetime.fromtimestamp, which may carry into the next second
+    second = int(created)
+    microsecond = round((created - second) * 1e6)
+    if microsecond >= 1000000:
+        second += 1
+        microsecond -= 1000000
+    return second, microsecond
+
+
+def _format_isotime(created: float) -> str:
+    """Same output as datetime.fromtimestamp(created).isoformat(), but cached per second."""
+    second, microsecond = _split_seconds(created)
+    text = _format_timestamp(second, _ISO_FORMAT)
+    if microsecond:
+        return f"{text}.{microsecond:06d}"
+    return text
+
+
+def _detect_link_support() -> bool:
+    """Detect if the terminal supports hyperlinks."""
+    # Check if we're in a terminal that likely supports hyperlinks
+    term = os.environ.get('TERM', '')
+    term_program = os.environ.get('TERM_PROGRAM', '')
+    
+    # Common terminals that support hyperlinks
+    supported_terms = ['xterm-256color', 'screen-256color', 'tmux-256color']
+    supported_programs = ['iTerm.app', 'Apple_Terminal', 'vscode']
+    
+    return (term in supported_terms or 
+            term_program in supported_programs or
+            'ITERM' in term_program)
+
+
+# The terminal does not change while the process runs, so detect it once
+_DEFAULT_ENABLE_LINKS = _detect_link_support()
+
+
+@lru_cache(maxsize=256)
+def _create_link(text: str, file_path: str, enable_links: bool) -> str:
+    """Create a clickable terminal link, memoized since few scripts do most logging."""
+    if not enable_links or not file_path:
+        return text.ljust(15)
+    
+    # ANSI escape sequence for clickable link
+    # Format: \033]8;;file://path\033\\text\033]8;;\033\\
+    link_start = f"\033]8;;file://{file_path}\033\\"
+    link_end = "\033]8;;\033\\"
+    return f"{link_start}{text}{link_end}".ljust(15)
+
+
+def _compile_line(date_format: str, enable_links: bool, level_strings: Dict) -> Callable:
+    """Build a function rendering '[timestamp] LEVEL calling_script: message' for fixed options."""
+    def format_line(record) -> str:
+        return ''.join((
+            '[', _format_timestamp(record.created, date_format), '] ',
+            level_strings[record.level], ' ',
+            # The path is only worked out when it goes into a link
+            _create_link(record.calling_script, record.calling_path if enable_links else "",
+                         enable_links), ': ',
+            record.get_message()
+        ))
+    return format_line
+
+
+class Formatter:
+    """Base class for log formatters."""
     
-    @abstractmethod
     def format(self, record) -> str:
-        """Format a log record into a string."""
-        pass
+        """Format a log record into a string. Must be implemented by subclasses."""
+        raise NotImplementedError
 
 
 class SimpleFormatter(Formatter):
@@ -23,64 +146,25 @@ class SimpleFormatter(Formatter):
     def __init__(self, date_format: str = "%Y-%m-%d %H:%M:%S", enable_links: bool = None):
         self.date_format = date_format
         # Auto-detect if we should enable links based on terminal support
-        if enable_links is None:
-            self.enable_links = self._detect_link_support()
-        else:
-            self.enable_links = enable_links
+        self.enable_links = _DEFAULT_ENABLE_LINKS if enable_links is None else enable_links
+        # Options are fixed here so the per-record line is built without branching
+        self._format_line = _compile_line(self.date_format, self.enable_links, _LEVEL_STR)
             
-    def _detect_link_support(self) -> bool:
-        """Detect if the terminal supports hyperlinks."""
-        import os
-        # Check if we're in a terminal that likely supports hyperlinks
-        term = os.environ.get('TERM', '')
-        term_program = os.environ.get('TERM_PROGRAM', '')
-        
-        # Common terminals that support hyperlinks
-        supported_terms = ['xterm-256color', 'screen-256color', 'tmux-256color']
-        supported_programs = ['iTerm.app', 'Apple_Terminal', 'vscode']
-        
-        return (term in supported_terms or 
-                term_program in supported_programs or
-                'ITERM' in os.environ.get('TERM_PROGRAM', ''))
-        
-    def _create_link(self, text: str, file_path: str) -> str:
-        """Create a clickable terminal link."""
-        if not self.enable_links or not file_path:
-            return text.ljust(15)
-        
-        try:
-            # ANSI escape sequence for clickable link
-            # Format: \033]8;;file://path\033\\text\033]8;;\033\\
-            link_start = f"\033]8;;file://{file_path}\033\\"
-            link_end = "\033]8;;\033\\"
-            linked_text = f"{link_start}{text}{link_end}"
-            return linked_text.ljust(15)
-        except:
-            # Fallback if something goes wrong
-            return text.ljust(15)
-        
     def format(self, record) -> str:
         """Format record as: [timestamp] LEVEL calling_script: message"""
-        timestamp = record.timestamp.strftime(self.date_format)
-        level = str(record.level).ljust(8)
-        
-        # Get script name and create clickable link if path is available
-        script_name = getattr(record, 'calling_script', record.name)
-        file_path = getattr(record, 'calling_path', "")
-        script_display = self._create_link(script_name, file_path)
-        
-        formatted = f"[{timestamp}] {level} {script_display}: {record.message}"
+        parts = [self._format_line(record)]
         
         # Add exception info if present
         if record.exc_text:
-            formatted += f"\n{record.exc_text}"
+            parts.append('\n')
+            parts.append(record.exc_text)
             
         # Add extra fields if present
         if record.extra:
-            extra_str = " ".join(f"{k}={v}" for k, v in record.extra.items())
-            formatted += f" | {extra_str}"
+            parts.append(' | ')
+            parts.append(" ".join(f"{k}={v}" for k, v in record.extra.items()))
             
-        return formatted
+        return ''.join(parts)
 
 
 class JSONFormatter(Formatter):
@@ -94,11 +178,11 @@ class JSONFormatter(Formatter):
         """Format record as JSON."""
         data = {
             "level": record.level.name,
-            "message": record.message
+            "message": record.get_message()
         }
         
         if self.include_timestamp:
-            data["timestamp"] = record.timestamp.isoformat()
+            data["timestamp"] = _format_isotime(record.created)
             
         if self.include_name:
             data["logger"] = record.name
@@ -111,7 +195,7 @@ class JSONFormatter(Formatter):
         if record.extra:
             data.update(record.extra)
             
-        return json.dumps(data, ensure_ascii=False)
+        return _json_dumps(data)
 
 
 class ColoredFormatter(Formatter):
@@ -131,109 +215,150 @@ class ColoredFormatter(Formatter):
         self.date_format = date_format
         self.use_colors = use_colors
         # Auto-detect if we should enable links based on terminal support
-        if enable_links is None:
-            self.enable_links = self._detect_link_support()
-        else:
-            self.enable_links = enable_links
+        self.enable_links = _DEFAULT_ENABLE_LINKS if enable_links is None else enable_links
+        # Options are fixed here so the per-record line is built without branching
+        level_strings = self._colored_levels() if use_colors else _LEVEL_STR
+        self._format_line = _compile_line(self.date_format, self.enable_links, level_strings)
             
-    def _detect_link_support(self) -> bool:
-        """Detect if the terminal supports hyperlinks."""
-        import os
-        # Check if we're in a terminal that likely supports hyperlinks
-        term = os.environ.get('TERM', '')
-        term_program = os.environ.get('TERM_PROGRAM', '')
-        
-        # Common terminals that support hyperlinks
-        supported_terms = ['xterm-256color', 'screen-256color', 'tmux-256color']
-        supported_programs = ['iTerm.app', 'Apple_Terminal', 'vscode']
-        
-        return (term in supported_terms or 
-                term_program in supported_programs or
-                'ITERM' in os.environ.get('TERM_PROGRAM', ''))
-        
-    def _create_link(self, text: str, file_path: str) -> str:
-        """Create a clickable terminal link."""
-        if not self.enable_links or not file_path:
-            return text.ljust(15)
-        
-        try:
-            # ANSI escape sequence for clickable link
-            # Format: \033]8;;file://path\033\\text\033]8;;\033\\
-            link_start = f"\033]8;;file://{file_path}\033\\"
-            link_end = "\033]8;;\033\\"
-            linked_text = f"{link_start}{text}{link_end}"
-            return linked_text.ljust(15)
-        except:
-            # Fallback if something goes wrong
-            return text.ljust(15)
-        
     def format(self, record) -> str:
         """Format record with colors."""
-        timestamp = record.timestamp.strftime(self.date_format)
-        level = str(record.level).ljust(8)
-        
-        # Get script name and create clickable link if path is available
-        script_name = getattr(record, 'calling_script', record.name)
-        file_path = getattr(record, 'calling_path', "")
-        script_display = self._create_link(script_name, file_path)
-        
-        if self.use_colors:
-            color = self.COLORS.get(record.level.name, '')
-            reset = self.COLORS['RESET']
-            formatted = f"[{timestamp}] {color}{level}{reset} {script_display}: {record.message}"
-        else:
-            formatted = f"[{timestamp}] {level} {script_display}: {record.message}"
+        parts = [self._format_line(record)]
         
         # Add exception info if present
         if record.exc_text:
             if self.use_colors:
-                formatted += f"\n{self.COLORS['ERROR']}{record.exc_text}{self.COLORS['RESET']}"
+                parts.extend(('\n', self.COLORS['ERROR'], record.exc_text, self.COLORS['RESET']))
             else:
-                formatted += f"\n{record.exc_text}"
+                parts.extend(('\n', record.exc_text))
                 
         # Add extra fields if present
         if record.extra:
             extra_str = " ".join(f"{k}={v}" for k, v in record.extra.items())
             if self.use_colors:
-                formatted += f" | {self.COLORS['DEBUG']}{extra_str}{self.COLORS['RESET']}"
+                parts.extend((' | ', self.COLORS['DEBUG'], extra_str, self.COLORS['RESET']))
             else:
-                formatted += f" | {extra_str}"
+                parts.extend((' | ', extra_str))
                 
-        return formatted
+        return ''.join(parts)
+        
+    def _colored_levels(self) -> Dict:
+        """Wrap the padded level names in this formatter's COLORS, once per formatter."""
+        colors = self.COLORS
+        return {level: f"{colors[level.name]}{text}{colors['RESET']}" for level, text in _LEVEL_STR.items()}
+
+
+# Level names indexed by level number, for lookups without enum attribute access
+_LEVEL_NAMES = tuple(level.name for level in LogLevel)
+
+# Padded level names, built once instead of per record
+_LEVEL_STR = {level: str(level).ljust(8) for level in LogLevel}
 
 
 class TemplateFormatter(Formatter):
     """Template-based formatter using a custom format string."""
     
+    # Record fields a template can reference, read straight from the record
+    FIELDS = {
+        'timestamp': lambda r: _format_timestamp(r.created, "%Y-%m-%d %H:%M:%S"),
+        'level': lambda r: _LEVEL_NAMES[r.levelno],
+        'name': lambda r: r.name,
+        'calling_script': lambda r: getattr(r, 'calling_script', r.name),
+        'calling_path': lambda r: getattr(r, 'calling_path', ""),
+        'message': lambda r: r.get_message(),
+        'levelname': lambda r: _LEVEL_NAMES[r.levelno],
+        'levelno': lambda r: r.levelno,
+        'extra': lambda r: r.extra
+    }
+    
+    CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+    
     def __init__(self, template: str = "{timestamp} [{level}] {name}: {message}"):
         self.template = template
+        self._parts = self._compile(template)
+        self._field_names = frozenset(
+            field for _, field, _, _, _ in (self._parts or ()) if field is not None
+        )
+        self._percent_template, self._getters = self._compile_percent(self._parts)
+        
+    def _compile(self, template: str):
+        """
+        Parse the template once into (literal, field, getter, format_spec, conversion) parts.
+        
+        Returns None if the template needs fields that only exist in extra data,
+        in which case format() falls back to str.format.
+        """
+        parts = []
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError:
+            return None
+        for literal, field, format_spec, conversion in parsed:
+            if field is None:
+                parts.append((literal, None, None, '', None))
+                continue
+            getter = self.FIELDS.get(field)
+            if getter is None or '{' in format_spec:
+                return None
+            parts.append((literal, field, getter, format_spec, conversion))
+        return tuple(parts)
+        
+    @staticmethod
+    def _compile_percent(parts):
+        """
+        Turn parsed parts into a %-template and its getters, so a record is one str % call.
+        
+        Returns (None, ()) when a field has a format spec, which % cannot express.
+        """
+        if parts is None:
+            return None, ()
+        pieces = []
+        getters = []
+        for literal, _, getter, format_spec, conversion in parts:
+            pieces.append(literal.replace('%', '%%'))
+            if getter is not None:
+                if format_spec:
+                    return None, ()
+                # %s, %r and %a match str.format's !s, !r and !a conversions
+                pieces.append('%' + (conversion or 's'))
+                getters.append(getter)
+        return ''.join(pieces), tuple(getters)
         
     def format(self, record) -> str:
         """Format record using the template."""
+        # Extra fields may shadow record fields, which only the slow path handles
+        if self._parts is None or (record.extra and not self._field_names.isdisjoint(record.extra)):
+            pieces = [self._format_dict(record)]
+        elif self._percent_template is not None:
+            pieces = [self._percent_template % tuple([getter(record) for getter in self._getters])]
+        else:
+            pieces = []
+            for literal, _, getter, format_spec, conversion in self._parts:
+                if literal:
+                    pieces.append(literal)
+                if getter is not None:
+                    value = getter(record)
+                    if conversion:
+                        value = self.CONVERSIONS[conversion](value)
+                    pieces.append(format(value, format_spec))
+            
+        # Add exception info if present
+        if record.exc_text:
+            pieces.append('\n')
+            pieces.append(record.exc_text)
+            
+        return ''.join(pieces)
+        
+    def _format_dict(self, record) -> str:
+        """Format record by building a field dict and calling str.format."""
         # Create a dict with all available fields
-        data = {
-            'timestamp': record.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            'level': str(record.level),
-            'name': record.name,
-            'calling_script': getattr(record, 'calling_script', record.name),
-            'calling_path': getattr(record, 'calling_path', ""),
-            'message': record.message,
-            'levelname': record.level.name,
-            'levelno': record.level.value
-        }
+        data = {name: getter(record) for name, getter in self.FIELDS.items()}
         
         # Add extra fields
         data.update(record.extra)
         
         # Format using template
         try:
-            formatted = self.template.format(**data)
+            return self.template.format(**data)
         except KeyError as e:
             # If template has unknown fields, fall back to simple format
-            formatted = f"[{data['timestamp']}] {data['level']} {data['name']}: {data['message']}"
-            
-        # Add exception info if present
-        if record.exc_text:
-            formatted += f"\n{record.exc_text}"
-            
-        return formatted 
\ No newline at end of file
+            return f"[{data['timestamp']}] {data['level']} {data['name']}: {data['message']}"
@@ -2,47 +2,87 @@
 Log handlers that determine where log messages are output.
 """
 
+import atexit
+import collections
+import heapq
 import sys
 import os
+import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import Optional, TextIO
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from .formatters import SimpleFormatter
+from .logger import ERROR, LogLevel
+
+
+# os.writev is missing on Windows, where batches go through the buffered file instead
+_writev = getattr(os, 'writev', None)
+# Most buffers a single writev() call accepts
+_IOV_MAX = 1024
 
 
 class Handler(ABC):
     """Abstract base class for log handlers."""
     
+    # Whether emit() may keep a reference to the record after returning.
+    # Loggers only reuse record objects when none of their handlers do.
+    retains_records = True
+    
     def __init__(self):
         self.formatter = None
         self.level = None  # Optional level filter
+        # Integer threshold for filter(); -1 lets every record through
+        self._min_level_value = -1
+        
+    @property
+    def formatter(self):
+        """The formatter used by format(), or None for the default."""
+        return self._formatter
+        
+    @formatter.setter
+    def formatter(self, formatter):
+        self._formatter = formatter
+        # Bound once here so emitting a record needs no None check
+        self._format_fn = self._default_format if formatter is None else formatter.format
         
     def set_formatter(self, formatter):
         """Set the formatter for this handler."""
         self.formatter = formatter
         
     def set_level(self, level):
-        """Set the minimum level for this handler."""
-        self.level = level
+        """Set the minimum level for this handler, as a LogLevel, its int value or None."""
+        self.level = LogLevel(level) if level is not None else None
+        self._min_level_value = self.level.value if level is not None else -1
         
     def format(self, record):
         """Format a record using the handler's formatter."""
-        if self.formatter is None:
-            # Default simple formatter
-            from .formatters import SimpleFormatter
-            self.formatter = SimpleFormatter()
-        return self.formatter.format(record)
+        return self._format_fn(record)
+        
+    def _default_format(self, record):
+        """Install the default simple formatter on first use and format with it."""
+        self.formatter = SimpleFormatter()
+        return self._format_fn(record)
         
     def filter(self, record):
         """Check if the record should be processed by this handler."""
-        if self.level is None:
-            return True
-        return record.level.value >= self.level.value
+        return record.levelno >= self._min_level_value
+        
+    def flush(self):
+        """Flush any buffered output. Handlers without a buffer do nothing."""
+        pass
         
     @abstractmethod
     def emit(self, record):
         """Emit a record. Must be implemented by subclasses."""
         pass
         
+    def emit_batch(self, records):
+        """Emit several records. Handlers that can write them at once override this."""
+        for record in records:
+            self.emit(record)
+        
     def handle(self, record):
         """Handle a record by filtering, formatting, and emitting it."""
         if self.filter(record):
@@ -56,115 +96,243 @@ class Handler(ABC):
 class ConsoleHandler(Handler):
     """Handler that outputs to console (stdout/stderr)."""
     
+    retains_records = False
+    
     def __init__(self, stream=None):
         super().__init__()
         self.stream = stream
+        # Bound write/flush of the stream, looked up once on the first emit
+        self._write = None
+        self._flush = None
         
     def emit(self, record):
         """Emit a record to the console."""
-        if self.stream is None:
-            # Use stderr for errors and critical, stdout for others
-            if record.level.value >= 3:  # ERROR or CRITICAL
-                self.stream = sys.stderr
-            else:
-                self.stream = sys.stdout
+        write = self._write
+        if write is None:
+            if self.stream is None:
+                # Use stderr for errors and critical, stdout for others
+                if record.levelno >= ERROR:  # ERROR or CRITICAL
+                    self.stream = sys.stderr
+                else:
+                    self.stream = sys.stdout
+            write = self._write = self.stream.write
+            self._flush = self.stream.flush
                 
-        formatted = self.format(record)
-        self.stream.write(formatted + '\n')
-        self.stream.flush()
+        # One write per line, so lines from other threads cannot land before its newline
+        write(self._format_fn(record) + '\n')
+        self._flush()
+        
+    def flush(self):
+        """Flush the console stream."""
+        if self.stream is not None:
+            self.stream.flush()
 
 
 class FileHandler(Handler):
     """Handler that outputs to a file."""
     
-    def __init__(self, filename, mode='a', encoding='utf-8'):
+    retains_records = False
+    
+    def __init__(self, filename, mode='a', encoding='utf-8',
+                 buffer_size=64*1024, flush_interval=30.0, fsync_on_error=True):
         super().__init__()
         self.filename = filename
         self.mode = mode
         self.encoding = encoding
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        # Force ERROR and CRITICAL records onto the disk, not just into the OS cache
+        self.fsync_on_error = fsync_on_error
         self._file = None
+        # Bound write method of the open file, rebound whenever it is reopened
+        self._write = None
+        # Descriptor for writev() of flushed batches, or None where that is unavailable
+        self._fd = None
+        self._last_flush = time.monotonic()
+        # Create directory if it doesn't exist; a bare filename has none
+        dirname = os.path.dirname(filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        _live_file_handlers.add(self)
         
     def _open_file(self):
         """Open the log file."""
         if self._file is None:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
-            self._file = open(self.filename, self.mode, encoding=self.encoding)
+            self._file = open(self.filename, self.mode, buffering=self.buffer_size,
+                              encoding=self.encoding)
+            self._write = self._file.write
+            # Lines are encoded one by one for writev(), which encodings with a BOM cannot do
+            self._fd = (self._file.fileno()
+                        if _writev is not None and _encodes_per_line(self.encoding) else None)
+            self._last_flush = time.monotonic()
             
     def emit(self, record):
         """Emit a record to the file."""
-        self._open_file()
-        formatted = self.format(record)
-        self._file.write(formatted + '\n')
+        if self._file is None:
+            self._open_file()
+        self._write_text(self._format_fn(record), record.levelno)
+        
+    def emit_batch(self, records):
+        """Emit several records with a single write call."""
+        if records:
+            if self._file is None:
+                self._open_file()
+            format_fn = self._format_fn
+            self._write_lines([format_fn(record) for record in records],
+                              max(record.levelno for record in records))
+        
+    def _write_lines(self, lines, level_value):
+        """Write formatted lines, going straight to the file with writev() when they would be flushed."""
+        if self._fd is None or (level_value < ERROR and
+                                time.monotonic() - self._last_flush <= self.flush_interval):
+            self._write_text('\n'.join(lines), level_value)
+            return
+        self._writev_lines(lines)
+        if level_value >= ERROR and self.fsync_on_error:
+            self._sync()
+        
+    def _writev_lines(self, lines):
+        """Write out buffered records, then the lines in one writev() syscall."""
         self._file.flush()
+        encoding = self.encoding
+        _writev_all(self._fd, [(line + '\n').encode(encoding) for line in lines])
+        self._last_flush = time.monotonic()
+        
+    def _write_text(self, text, level_value):
+        """Write formatted output and a newline, flushing on errors or when the buffer is stale."""
+        write = self._write
+        write(text)
+        write('\n')
+        # Routine records stay in the buffer so bursts are written with few syscalls
+        if level_value >= ERROR:
+            self.flush()
+            if self.fsync_on_error:
+                self._sync()
+        elif time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+        
+    def _sync(self):
+        """Wait until flushed records are stored on disk."""
+        os.fsync(self._file.fileno())
+        
+    def flush(self):
+        """Flush buffered records to disk."""
+        if self._file:
+            self._file.flush()
+        self._last_flush = time.monotonic()
         
     def close(self):
         """Close the file."""
         if self._file:
             self._file.close()
             self._file = None
+            self._fd = None
+
+
+def _encodes_per_line(encoding):
+    """Check that separately encoded text joins up like text encoded at once, i.e. no BOM."""
+    return 'aa'.encode(encoding) == 'a'.encode(encoding) * 2
+
+
+def _writev_all(fd, buffers):
+    """Write every buffer to fd with as few writev() calls as possible."""
+    for start in range(0, len(buffers), _IOV_MAX):
+        chunk = buffers[start:start + _IOV_MAX]
+        written = _writev(fd, chunk)
+        if written < sum(map(len, chunk)):
+            # Short writes are rare for regular files; write out the rest plainly
+            data = b''.join(chunk)[written:]
+            while data:
+                data = data[os.write(fd, data):]
 
 
 class RotatingFileHandler(FileHandler):
     """Handler that rotates log files based on size or time."""
     
+    retains_records = False
+    
     def __init__(self, filename, max_bytes=10*1024*1024, backup_count=5, 
                  max_files=100, mode='a', encoding='utf-8'):
         super().__init__(filename, mode, encoding)
         self.max_bytes = max_bytes
         self.backup_count = backup_count
         self.max_files = max_files
+        # Tracked by hand, since tell() would flush the write buffer
+        self._bytes_written = 0
+        # Backup slot (1..backup_count) the next rotation writes to, found on first use
+        self._next_slot = None
+        
+    def _open_file(self):
+        """Open the log file and pick up its current size."""
+        if self._file is None:
+            super()._open_file()
+            self._bytes_written = self._file.tell()
         
     def emit(self, record):
         """Emit a record and rotate if necessary."""
-        if self._file and self._file.tell() >= self.max_bytes:
+        if self._file and self._bytes_written >= self.max_bytes:
             self.rotate()
         super().emit(record)
         
+    def emit_batch(self, records):
+        """Emit several records at once, rotating first if necessary."""
+        if self._file and self._bytes_written >= self.max_bytes:
+            self.rotate()
+        super().emit_batch(records)
+        
+    def _write_text(self, text, level_value):
+        """Write formatted output and count its size towards max_bytes."""
+        # Counts characters, which matches bytes for ASCII output
+        self._bytes_written += len(text) + 1
+        super()._write_text(text, level_value)
+        
+    def _writev_lines(self, lines):
+        """Write lines with writev() and count their size towards max_bytes."""
+        self._bytes_written += sum(map(len, lines)) + len(lines)
+        super()._writev_lines(lines)
+        
     def rotate(self):
         """Rotate the log file."""
         if self._file:
             self._file.close()
             self._file = None
+            self._fd = None
             
-        # Rotate existing backup files
-        for i in range(self.backup_count - 1, 0, -1):
-            src = f"{self.filename}.{i}"
-            dst = f"{self.filename}.{i + 1}"
-            if os.path.exists(src):
-                if os.path.exists(dst):
-                    os.remove(dst)
-                os.rename(src, dst)
-                
-        # Move current file to .1
+        # Backups take the slots .1 to .backup_count in turn, so each rotation
+        # is a single rename that replaces the oldest backup
         if os.path.exists(self.filename):
-            os.rename(self.filename, f"{self.filename}.1")
+            slot_count = max(self.backup_count, 1)
+            slot = self._next_slot
+            if slot is None:
+                slot = self._find_oldest_slot(slot_count)
+            os.replace(self.filename, f"{self.filename}.{slot}")
+            self._next_slot = slot % slot_count + 1
             
         # Clean up old files if we exceed max_files
         self._cleanup_old_files()
         
+    def _find_oldest_slot(self, slot_count):
+        """Get the first unused backup slot, or the one holding the oldest backup."""
+        oldest_slot, oldest_mtime = 1, None
+        for slot in range(1, slot_count + 1):
+            try:
+                mtime = os.stat(f"{self.filename}.{slot}").st_mtime
+            except FileNotFoundError:
+                return slot
+            if oldest_mtime is None or mtime < oldest_mtime:
+                oldest_slot, oldest_mtime = slot, mtime
+        return oldest_slot
+        
     def _cleanup_old_files(self):
         """Remove old log files if we exceed max_files limit."""
-        import glob
-        pattern = f"{self.filename}.*"
-        files = glob.glob(pattern)
-        
-        # Sort files by modification time (oldest first)
-        files.sort(key=lambda x: os.path.getmtime(x))
-        
-        # If we have more files than max_files, remove the oldest ones
-        if len(files) > self.max_files:
-            files_to_remove = files[:-self.max_files]
-            for old_file in files_to_remove:
-                try:
-                    os.remove(old_file)
-                except OSError:
-                    pass
+        _remove_oldest_backups(self.filename, self.max_files)
 
 
 class TimedRotatingFileHandler(FileHandler):
     """Handler that rotates log files based on time intervals."""
     
+    retains_records = False
+    
     def __init__(self, filename, when='midnight', interval=1, backup_count=5,
                  max_files=100, mode='a', encoding='utf-8'):
         super().__init__(filename, mode, encoding)
@@ -174,27 +342,52 @@ class TimedRotatingFileHandler(FileHandler):
         self.max_files = max_files
         self.last_rotation = datetime.now()
         
+    @property
+    def last_rotation(self):
+        """When the log file was last rotated; setting it reschedules the next rotation."""
+        return self._last_rotation
+        
+    @last_rotation.setter
+    def last_rotation(self, value):
+        self._last_rotation = value
+        # Epoch time of the next rotation, so records are checked with one float compare
+        self._rollover_at = self._compute_rollover()
+        
     def emit(self, record):
         """Emit a record and rotate if necessary."""
-        if self.should_rotate(record.timestamp):
+        if record.created >= self._rollover_at:
             self.rotate()
         super().emit(record)
         
-    def should_rotate(self, timestamp):
-        """Check if rotation is needed."""
+    def emit_batch(self, records):
+        """Emit several records at once, rotating first if necessary."""
+        if records and records[0].created >= self._rollover_at:
+            self.rotate()
+        super().emit_batch(records)
+        
+    def _compute_rollover(self):
+        """Get the epoch time of the next rotation after last_rotation."""
         if self.when == 'midnight':
-            return timestamp.date() != self.last_rotation.date()
+            next_day = self.last_rotation.date() + timedelta(days=1)
+            return datetime(next_day.year, next_day.month, next_day.day).timestamp()
         elif self.when == 'hour':
-            return (timestamp - self.last_rotation).total_seconds() >= 3600 * self.interval
+            return self.last_rotation.timestamp() + 3600 * self.interval
         elif self.when == 'minute':
-            return (timestamp - self.last_rotation).total_seconds() >= 60 * self.interval
-        return False
+            return self.last_rotation.timestamp() + 60 * self.interval
+        return float('inf')
+        
+    def should_rotate(self, timestamp):
+        """Check if rotation is needed at the given time, a datetime or epoch seconds."""
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        return timestamp >= self._rollover_at
         
     def rotate(self):
         """Rotate the log file."""
         if self._file:
             self._file.close()
             self._file = None
+            self._fd = None
             
         # Create backup filename with timestamp
         timestamp = self.last_rotation.strftime("%Y%m%d_%H%M%S")
@@ -209,27 +402,32 @@ class TimedRotatingFileHandler(FileHandler):
         
     def _remove_old_backups(self):
         """Remove old backup files."""
-        import glob
-        pattern = f"{self.filename}.*"
-        files = glob.glob(pattern)
-        
-        # Sort files by modification time (oldest first)
-        files.sort(key=lambda x: os.path.getmtime(x))
-        
         # Keep only the most recent files, respecting both backup_count and max_files
-        max_to_keep = min(self.backup_count, self.max_files)
-        if len(files) > max_to_keep:
-            files_to_remove = files[:-max_to_keep]
-            for old_file in files_to_remove:
-                try:
-                    os.remove(old_file)
-                except OSError:
-                    pass
+        _remove_oldest_backups(self.filename, min(self.backup_count, self.max_files))
+
+
+def _remove_oldest_backups(filename, max_to_keep):
+    """Delete the oldest '<filename>.*' backups so that at most max_to_keep remain."""
+    directory = os.path.dirname(filename) or '.'
+    prefix = os.path.basename(filename) + '.'
+    # scandir lists the directory once; the stat() results are cached on each entry
+    with os.scandir(directory) as it:
+        backups = [entry for entry in it if entry.name.startswith(prefix)]
+    excess = len(backups) - max_to_keep
+    if excess <= 0:
+        return
+    for entry in heapq.nsmallest(excess, backups, key=lambda entry: entry.stat().st_mtime):
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
 
 
 class NullHandler(Handler):
     """Handler that does nothing (useful for testing)."""
     
+    retains_records = False
+    
     def emit(self, record):
         """Do nothing."""
         pass
@@ -241,18 +439,36 @@ class MemoryHandler(Handler):
     def __init__(self, capacity=1000):
         super().__init__()
         self.capacity = capacity
-        self.buffer = []
+        # Oldest records are dropped automatically once capacity is reached
+        self.buffer = collections.deque(maxlen=capacity)
         
     def emit(self, record):
         """Store the record in memory."""
         self.buffer.append(record)
-        if len(self.buffer) > self.capacity:
-            self.buffer.pop(0)
+            
+    def emit_batch(self, records):
+        """Store several records."""
+        self.buffer.extend(records)
             
     def get_records(self):
         """Get all stored records."""
-        return self.buffer.copy()
+        return list(self.buffer)
         
     def clear(self):
         """Clear all stored records."""
-        self.buffer.clear() 
\ No newline at end of file
+        self.buffer.clear() 
+
+
+# File handlers still alive, so buffered records can be written out at exit
+_live_file_handlers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_file_handlers():
+    """Flush and close every live file handler at interpreter shutdown."""
+    for handler in list(_live_file_handlers):
+        try:
+            handler.flush()
+            handler.close()
+        except Exception as e:
+            sys.stderr.write(f"Handler error: {e}\n")
@@ -2,18 +2,25 @@
 Core Logger implementation with LogLevel enum and main logging functionality.
 """
 
+import atexit
+import collections
+import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
-from enum import Enum
-from typing import List, Optional, Any, Dict, TYPE_CHECKING
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional, Any, Dict, TYPE_CHECKING
 import traceback
 
 if TYPE_CHECKING:
     from .handlers import Handler
 
 
-class LogLevel(Enum):
-    """Log levels in order of severity."""
+class LogLevel(IntEnum):
+    """Log levels in order of severity; members compare like plain ints."""
     DEBUG = 0
     INFO = 1
     WARNING = 2
@@ -23,158 +30,603 @@ class LogLevel(Enum):
     def __str__(self):
         return self.name
 
-    def __lt__(self, other):
-        if isinstance(other, LogLevel):
-            return self.value < other.value
-        return NotImplemented
+
+# Level values as plain ints for hot-path comparisons; LogLevel.value goes
+# through a Python-level property on every access
+DEBUG = LogLevel.DEBUG.value
+INFO = LogLevel.INFO.value
+WARNING = LogLevel.WARNING.value
+ERROR = LogLevel.ERROR.value
+CRITICAL = LogLevel.CRITICAL.value
 
 
 class Logger:
     """Main Logger class that handles log messages and distributes them to handlers."""
     
+    __slots__ = ('name', 'level', '_level_value', '_handlers', '_propagate', '_parent',
+                 'children', '_effective_handlers', '_recycle_records', '_async_dispatch')
+    
     def __init__(self, name: str = "default"):
         self.name = name
         self.level = LogLevel.INFO
-        self.handlers: List['Handler'] = []
-        self.propagate = True
-        self.parent: Optional['Logger'] = None
+        self._level_value = self.level.value
+        # Replaced, never mutated, so readers can iterate it without locking
+        self._handlers: tuple = ()
+        self._propagate = True
+        self._parent: Optional['Logger'] = None
         self.children: Dict[str, 'Logger'] = {}
+        # Own handlers plus those of propagating ancestors, built on first use
+        self._effective_handlers: Optional[tuple] = None
+        # True when no effective handler keeps records, so they can be pooled
+        self._recycle_records = False
+        # Whether handlers run on the background dispatch thread
+        self._async_dispatch = False
+        
+    @property
+    def handlers(self) -> tuple:
+        """This logger's own handlers."""
+        return self._handlers
+        
+    @property
+    def propagate(self) -> bool:
+        """Whether records are also sent to the parent logger's handlers."""
+        return self._propagate
+        
+    @propagate.setter
+    def propagate(self, value: bool):
+        self._propagate = value
+        self._invalidate_handlers()
+        
+    @property
+    def parent(self) -> Optional['Logger']:
+        """The parent logger, if any."""
+        return self._parent
+        
+    @parent.setter
+    def parent(self, value: Optional['Logger']):
+        self._parent = value
+        self._invalidate_handlers()
         
     def set_level(self, level: LogLevel):
-        """Set the minimum log level for this logger."""
-        self.level = level
+        """Set the minimum log level for this logger, as a LogLevel or its int value."""
+        self.level = LogLevel(level)
+        self._level_value = self.level.value
+        
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """
+        Check whether a message at this level would be logged.
+        
+        Use it to skip building expensive messages, e.g.
+        if logger.is_enabled_for(LogLevel.DEBUG): logger.debug(f"{compute()}")
+        """
+        return level >= self._level_value
+        
+    def set_async_dispatch(self, enabled: bool):
+        """
+        Run handlers on a background thread so logging calls return immediately.
+        
+        Records are queued with the handlers they should reach and emitted in
+        order by a shared daemon thread. Call flush() or close_all_loggers()
+        to wait for queued records.
+        """
+        self._async_dispatch = enabled
+        if enabled:
+            _start_dispatcher()
         
     def add_handler(self, handler: 'Handler'):
         """Add a handler to this logger."""
-        self.handlers.append(handler)
+        with _handlers_lock:
+            self._handlers = self._handlers + (handler,)
+            self._invalidate_handlers()
         
     def remove_handler(self, handler: 'Handler'):
         """Remove a handler from this logger."""
-        if handler in self.handlers:
-            self.handlers.remove(handler)
+        with _handlers_lock:
+            if handler in self._handlers:
+                handlers = list(self._handlers)
+                handlers.remove(handler)
+                self._handlers = tuple(handlers)
+                self._invalidate_handlers()
             
     def clear_handlers(self):
         """Remove all handlers from this logger."""
-        self.handlers.clear()
+        with _handlers_lock:
+            self._handlers = ()
+            self._invalidate_handlers()
+        
+    def _invalidate_handlers(self):
+        """Drop the cached handler tuple of this logger and all its descendants."""
+        with _handlers_lock:
+            self._effective_handlers = None
+            for child in self.children.values():
+                child._invalidate_handlers()
+            
+    def _get_effective_handlers(self) -> tuple:
+        """Get own handlers followed by those of propagating ancestors, each only once."""
+        handlers = self._effective_handlers
+        if handlers is None:
+            # Rebuilt under the lock so a concurrent add_handler cannot be
+            # overwritten by a tuple computed from the old handlers
+            with _handlers_lock:
+                collected = list(self._handlers)
+                if self._propagate and self._parent is not None:
+                    for handler in self._parent._get_effective_handlers():
+                        if handler not in collected:
+                            collected.append(handler)
+                self._recycle_records = not any(_retains_records(handler) for handler in collected)
+                handlers = self._effective_handlers = tuple(collected)
+        return handlers
+        
+    def flush(self):
+        """Flush all handlers of this logger."""
+        if self._async_dispatch:
+            # Let the dispatch thread emit everything queued so far
+            _wait_for_dispatcher()
+        for handler in self._handlers:
+            if hasattr(handler, 'flush'):
+                try:
+                    handler.flush()
+                except Exception as e:
+                    sys.stderr.write(f"Handler error: {e}\n")
         
     def get_child(self, name: str) -> 'Logger':
         """Get or create a child logger."""
         if name not in self.children:
             child = Logger(f"{self.name}.{name}")
             child.parent = self
-            child.level = self.level
-            child.handlers = self.handlers.copy()
+            # Parent handlers are reached through propagation, not copied
+            child.set_level(self.level)
+            child._async_dispatch = self._async_dispatch
             self.children[name] = child
         return self.children[name]
         
     def _get_calling_script(self) -> tuple[str, str]:
         """Get the name of the script that called the logger and its relative path."""
-        import inspect
-        import os
-        
-        # Get the current stack
-        stack = inspect.stack()
-        
-        # Only skip logger implementation files
-        skip_files = [
-            'logger.py', 'formatters.py', 'handlers.py', 'registry.py', 'config.py'
-        ]
-        for frame_info in stack:
-            filename = frame_info.filename
-            base = os.path.basename(filename)
-            if base not in skip_files and '__pycache__' not in filename:
-                # Extract just the filename without path and strip .py
-                script_name = base
-                if script_name.endswith('.py'):
-                    script_name = script_name[:-3]
-                
-                # Convert to relative path from current working directory
-                try:
-                    relative_path = os.path.relpath(filename, os.getcwd())
-                except ValueError:
-                    # Fallback to absolute path if relative path fails
-                    relative_path = filename
-                
-                return script_name, relative_path
+        # Start at our caller; frames inside this file are skipped below
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            site = _CALL_SITES.get(code)
+            if site is None:
+                site = _CALL_SITES[code] = _resolve_call_site(code.co_filename)
+            if site:
+                return site
+            frame = frame.f_back
         # Fallback to the logger name if we can't find the calling script
         return self.name, ""
 
-    def _log(self, level: LogLevel, message: str, *args, **kwargs):
-        """Internal logging method."""
-        if level.value < self.level.value:
+    def _log(self, level: LogLevel, message: str, args: tuple = (),
+             extra: Optional[Dict[str, Any]] = None, exc_info: bool = False):
+        """
+        Internal logging method.
+        
+        extra holds the caller's keyword arguments. Fields passed as
+        extra={...} are used directly, with any other keywords added on top.
+        """
+        if level < self._level_value:
             return
-            
-        # Format message with args
-        if args:
-            message = message % args
+        handlers = self._get_effective_handlers()
+        if not handlers:
+            # Nothing would receive the record, so don't build it
+            return
+        if extra and 'extra' in extra:
+            fields = extra.pop('extra')
+            if extra:
+                fields = {**fields, **extra} if fields else extra
+            elif fields:
+                # Copied, since records may outlive the call and the caller may reuse the dict
+                fields = dict(fields)
+            extra = fields
             
         # Get the calling script name and path from the stack trace
         calling_script, calling_path = self._get_calling_script()
             
         # Create log record
-        record = LogRecord(
-            name=self.name,
-            level=level,
-            message=message,
-            timestamp=datetime.now(),
-            calling_script=calling_script,
-            calling_path=calling_path,
-            **kwargs
-        )
-        
-        # Send to handlers
-        for handler in self.handlers:
-            try:
-                handler.emit(record)
-            except Exception as e:
-                # Prevent infinite recursion if handler fails
-                sys.stderr.write(f"Handler error: {e}\n")
-                
-        # Propagate to parent if enabled
-        if self.propagate and self.parent:
-            self.parent._log(level, message, *args, **kwargs)
+        record = _record_pool.acquire(self.name, level, message, time.time(), args,
+                                      calling_script, calling_path, exc_info, extra)
+        self._handle(handlers, record)
+        
+    def _log_fast(self, level: LogLevel, message: str):
+        """Log a plain message with no args, extra fields or exception info."""
+        handlers = self._get_effective_handlers()
+        if not handlers:
+            return
+        calling_script, calling_path = self._get_calling_script()
+        record = _record_pool.acquire(self.name, level, message, time.time(), (),
+                                      calling_script, calling_path)
+        self._handle(handlers, record)
+        
+    def _handle(self, handlers: tuple, record: 'LogRecord'):
+        """Send a record to the effective handlers, including the ones inherited through propagation."""
+        if self._async_dispatch:
+            _dispatch(handlers, record)
+        else:
+            _emit_record(handlers, record)
+            # No handler kept a reference, so the record object can be reused
+            if self._recycle_records:
+                _record_pool.release(record)
             
     def debug(self, message: str, *args, **kwargs):
         """Log a debug message."""
-        self._log(LogLevel.DEBUG, message, *args, **kwargs)
+        if 0 < self._level_value:  # DEBUG
+            return
+        if not args and not kwargs:
+            self._log_fast(LogLevel.DEBUG, message)
+        else:
+            exc_info = kwargs.pop('exc_info', False)
+            self._log(LogLevel.DEBUG, message, args, kwargs, exc_info)
         
     def info(self, message: str, *args, **kwargs):
         """Log an info message."""
-        self._log(LogLevel.INFO, message, *args, **kwargs)
+        if 1 < self._level_value:  # INFO
+            return
+        if not args and not kwargs:
+            self._log_fast(LogLevel.INFO, message)
+        else:
+            exc_info = kwargs.pop('exc_info', False)
+            self._log(LogLevel.INFO, message, args, kwargs, exc_info)
         
     def warning(self, message: str, *args, **kwargs):
         """Log a warning message."""
-        self._log(LogLevel.WARNING, message, *args, **kwargs)
+        if 2 < self._level_value:  # WARNING
+            return
+        if not args and not kwargs:
+            self._log_fast(LogLevel.WARNING, message)
+        else:
+            exc_info = kwargs.pop('exc_info', False)
+            self._log(LogLevel.WARNING, message, args, kwargs, exc_info)
         
     def error(self, message: str, *args, **kwargs):
         """Log an error message."""
-        self._log(LogLevel.ERROR, message, *args, **kwargs)
+        if 3 < self._level_value:  # ERROR
+            return
+        if not args and not kwargs:
+            self._log_fast(LogLevel.ERROR, message)
+        else:
+            exc_info = kwargs.pop('exc_info', False)
+            self._log(LogLevel.ERROR, message, args, kwargs, exc_info)
         
     def critical(self, message: str, *args, **kwargs):
         """Log a critical message."""
-        self._log(LogLevel.CRITICAL, message, *args, **kwargs)
+        if 4 < self._level_value:  # CRITICAL
+            return
+        if not args and not kwargs:
+            self._log_fast(LogLevel.CRITICAL, message)
+        else:
+            exc_info = kwargs.pop('exc_info', False)
+            self._log(LogLevel.CRITICAL, message, args, kwargs, exc_info)
         
     def exception(self, message: str, *args, **kwargs):
         """Log an exception with traceback."""
-        kwargs['exc_info'] = True
-        self._log(LogLevel.ERROR, message, *args, **kwargs)
+        kwargs.pop('exc_info', None)
+        self._log(LogLevel.ERROR, message, args, kwargs, True)
+        
+    def log_many(self, level: LogLevel, messages):
+        """
+        Log several plain messages at one level.
+        
+        Each message still becomes its own record, but handlers receive them
+        together through emit_batch(), so file handlers write them at once.
+        """
+        if level < self._level_value or not messages:
+            return
+        handlers = self._get_effective_handlers()
+        if not handlers:
+            return
+        level = LogLevel(level)
+        calling_script, calling_path = self._get_calling_script()
+        created = time.time()
+        records = [LogRecord(self.name, level, message, created, (), calling_script, calling_path)
+                   for message in messages]
+        if self._async_dispatch:
+            # Queued as one item so the dispatch thread emits it as a batch too
+            _dispatch(handlers, records)
+        else:
+            _emit_records(handlers, records)
+
+
+# Guards handler tuples and the effective-handler caches of all loggers.
+# Reentrant because invalidation and rebuilding recurse through the hierarchy.
+_handlers_lock = threading.RLock()
+
+# Shared by all records without extra fields; never mutated
+_EMPTY_EXTRA: Dict[str, Any] = {}
+
+
+def _retains_records(handler) -> bool:
+    """
+    Check whether a handler may keep records after emitting them.
+    
+    A retains_records = False flag is only trusted if no subclass below the
+    class declaring it overrides emit() or emit_batch(), since such a
+    subclass may keep the records it is given.
+    """
+    own = getattr(handler, '__dict__', {})
+    if 'emit' in own or 'emit_batch' in own:
+        return True
+    if 'retains_records' in own:
+        return own['retains_records'] is not False
+    for cls in type(handler).__mro__:
+        attrs = cls.__dict__
+        if 'retains_records' in attrs:
+            return attrs['retains_records'] is not False
+        if 'emit' in attrs or 'emit_batch' in attrs:
+            return True
+    return True
+
+
+# Logger implementation files, skipped when looking for the calling script
+_SKIP_BASENAMES = frozenset({'logger.py', 'formatters.py', 'handlers.py', 'registry.py', 'config.py'})
+
+# Resolved call site per code object: (script_name, absolute_path), or () to skip the frame
+_CALL_SITES: Dict[Any, tuple] = {}
+
+
+@lru_cache(maxsize=1024)
+def _resolve_call_site(filename: str) -> tuple:
+    """Map a source file to (script_name, absolute_path), or () for logger internals."""
+    base = os.path.basename(filename)
+    if base in _SKIP_BASENAMES:
+        return ()
+    # Extract just the filename without path and strip .py
+    script_name = base[:-3] if base.endswith('.py') else base
+    # Absolute, since the working directory may change before the record is formatted.
+    # Pseudo files such as '<stdin>' have no path to resolve.
+    return script_name, filename if filename.startswith('<') else os.path.abspath(filename)
+
+
+def _relative_path(path: str) -> str:
+    """Get path relative to the current working directory, or unchanged if it has none."""
+    if not path or path.startswith('<'):
+        return path
+    try:
+        return _relpath(path, os.getcwd())
+    except ValueError:
+        # Fallback to absolute path if relative path fails
+        return path
+
+
+@lru_cache(maxsize=256)
+def _relpath(path: str, cwd: str) -> str:
+    """os.path.relpath, memoized since few files do most logging."""
+    return os.path.relpath(path, cwd)
 
 
 class LogRecord:
     """Represents a single log record with all relevant information."""
     
-    def __init__(self, name: str, level: LogLevel, message: str, timestamp: datetime, **kwargs):
+    __slots__ = ('name', 'level', 'levelno', 'created', '_timestamp', '_raw_msg', '_args', '_message',
+                 'calling_script', '_calling_file', 'exc_info', 'extra', '_exc_tuple', '_exc_text')
+    
+    def __init__(self, name: str, level: LogLevel, message: str, created: float,
+                 args: tuple = (), calling_script: Optional[str] = None,
+                 calling_path: str = "", exc_info: bool = False,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.reset(name, level, message, created, args, calling_script,
+                   calling_path, exc_info, extra)
+
+    def reset(self, name: str, level: LogLevel, message: str, created: float,
+              args: tuple = (), calling_script: Optional[str] = None,
+              calling_path: str = "", exc_info: bool = False,
+              extra: Optional[Dict[str, Any]] = None):
+        """Reinitialize every field in place, so pooled records can be reused."""
         self.name = name
         self.level = level
-        self.message = message
-        self.timestamp = timestamp
-        self.calling_script = kwargs.get('calling_script', name)
-        self.calling_path = kwargs.get('calling_path', "")
-        self.exc_info = kwargs.get('exc_info', False)
-        self.extra = {k: v for k, v in kwargs.items() if k not in ['exc_info', 'calling_script', 'calling_path']}
-        
-        # Add exception info if present
-        if self.exc_info:
-            self.exc_text = ''.join(traceback.format_exc())
+        # Plain int copy of the level, read from the member attribute behind .value
+        self.levelno = level._value_
+        # Creation time in epoch seconds; the datetime is only built if a formatter asks
+        self.created = created
+        self._timestamp = None
+        # The message is merged with its args lazily, see get_message()
+        self._raw_msg = message
+        self._args = args
+        self._message = None
+        self.calling_script = name if calling_script is None else calling_script
+        # Made relative to the working directory only when calling_path is read
+        self._calling_file = calling_path
+        # Most records carry no extra fields, so they share one empty dict
+        self.extra = extra if extra else _EMPTY_EXTRA
+        self.exc_info = exc_info
+        
+        # Capture exception info now, but only format the traceback on demand
+        if not exc_info:
+            self._exc_tuple = None
+        elif isinstance(exc_info, BaseException):
+            self._exc_tuple = (type(exc_info), exc_info, exc_info.__traceback__)
+        elif isinstance(exc_info, tuple):
+            self._exc_tuple = exc_info
         else:
-            self.exc_text = None 
\ No newline at end of file
+            self._exc_tuple = sys.exc_info()
+        self._exc_text = None
+
+    def get_message(self) -> str:
+        """Return the message merged with its args, formatting it only once."""
+        if self._message is None:
+            # Non-string messages such as ints or exceptions are logged as their str()
+            message = str(self._raw_msg)
+            # Args are only merged when the message has conversion specifiers
+            if self._args and '%' in message:
+                message = message % self._args
+            self._message = message
+        return self._message
+
+    @property
+    def timestamp(self) -> datetime:
+        """The creation time as a local datetime, built on first access."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.created)
+        return self._timestamp
+
+    @property
+    def calling_path(self) -> str:
+        """Path of the calling script relative to the current working directory."""
+        return _relative_path(self._calling_file)
+
+    @property
+    def message(self) -> str:
+        """The fully formatted log message."""
+        return self.get_message()
+
+    @property
+    def exc_text(self) -> Optional[str]:
+        """The formatted traceback, rendered the first time it is read."""
+        if self._exc_text is None and self._exc_tuple is not None:
+            self._exc_text = ''.join(traceback.format_exception(*self._exc_tuple))
+        return self._exc_text
+
+
+class _LogRecordPool(threading.local):
+    """Per-thread free list of LogRecord objects, to avoid allocating one per call."""
+
+    def __init__(self, size: int = 128):
+        # A full pool drops the oldest spare record instead of growing
+        self.free = collections.deque(maxlen=size)
+
+    def acquire(self, *fields) -> LogRecord:
+        """Get a LogRecord for the given fields, reusing a pooled one when available."""
+        free = self.free
+        if free:
+            record = free.pop()
+            record.reset(*fields)
+            return record
+        return LogRecord(*fields)
+
+    def release(self, record: LogRecord):
+        """Return a record nobody references any more to this thread's pool."""
+        # Drop references to caller objects while the record sits in the pool
+        record._args = ()
+        record._message = None
+        record.extra = _EMPTY_EXTRA
+        record._exc_tuple = None
+        self.free.append(record)
+
+
+_record_pool = _LogRecordPool()
+
+
+def _emit_record(handlers: tuple, record: LogRecord):
+    """Emit a record to each handler, reporting handler failures on stderr."""
+    handlers = iter(handlers)
+    # A single try block covers the whole loop. After a failure the loop
+    # resumes with the next handler, so a bad handler cannot starve the rest.
+    while True:
+        try:
+            for handler in handlers:
+                # Handler levels are honoured here, since emit() does not filter
+                if record.levelno >= getattr(handler, '_min_level_value', -1):
+                    handler.emit(record)
+            return
+        except Exception as e:
+            # Prevent infinite recursion if handler fails
+            sys.stderr.write(f"Handler error: {e}\n")
+
+
+def _emit_records(handlers: tuple, records: list):
+    """Emit records of a single level to each handler as one batch."""
+    levelno = records[0].levelno
+    for handler in handlers:
+        if levelno < getattr(handler, '_min_level_value', -1):
+            continue
+        try:
+            emit_batch = getattr(handler, 'emit_batch', None)
+            if emit_batch is not None:
+                emit_batch(records)
+            else:
+                for record in records:
+                    handler.emit(record)
+        except Exception as e:
+            # Prevent infinite recursion if handler fails
+            sys.stderr.write(f"Handler error: {e}\n")
+
+
+# Background dispatch shared by all loggers with async dispatch enabled.
+# Queue items are (handlers, record) pairs, (handlers, [records]) batches from
+# log_many(), (None, event) barriers, or None to stop.
+_dispatch_queue: Optional[queue.SimpleQueue] = None
+_dispatch_thread: Optional[threading.Thread] = None
+# Held around every put so nothing is queued behind the stop sentinel.
+# Reentrant so _dispatch can start the thread while holding it.
+_dispatch_lock = threading.RLock()
+_dispatch_atexit_registered = False
+_DISPATCH_BATCH_SIZE = 256
+# Producers wait for the dispatch thread once this many items are pending
+_DISPATCH_MAX_PENDING = 65536
+
+
+def _dispatch_worker(items: queue.SimpleQueue):
+    """Emit queued records, draining up to a batch per wake-up."""
+    while True:
+        batch = [items.get()]
+        # This is the only consumer, so everything qsize() reports is there to take
+        # without blocking, and the drain never ends in a queue.Empty exception
+        get_nowait = items.get_nowait
+        for _ in range(min(items.qsize(), _DISPATCH_BATCH_SIZE - 1)):
+            batch.append(get_nowait())
+        for item in batch:
+            if item is None:
+                return
+            handlers, payload = item
+            if handlers is None:
+                # Barrier from _wait_for_dispatcher
+                payload.set()
+            elif payload.__class__ is list:
+                _emit_records(handlers, payload)
+            else:
+                _emit_record(handlers, payload)
+
+
+def _start_dispatcher() -> queue.SimpleQueue:
+    """Start the dispatch thread if it is not running and return its queue."""
+    global _dispatch_queue, _dispatch_thread, _dispatch_atexit_registered
+    with _dispatch_lock:
+        if _dispatch_queue is None:
+            _dispatch_queue = queue.SimpleQueue()
+            _dispatch_thread = threading.Thread(
+                target=_dispatch_worker, args=(_dispatch_queue,),
+                name="LoggerDispatch", daemon=True
+            )
+            _dispatch_thread.start()
+            if not _dispatch_atexit_registered:
+                atexit.register(shutdown_dispatcher)
+                _dispatch_atexit_registered = True
+        return _dispatch_queue
+
+
+def _dispatch(handlers: tuple, record):
+    """Queue a record, or a list of records emitted as one batch, for the dispatch thread."""
+    items = _dispatch_queue
+    if items is not None and items.qsize() >= _DISPATCH_MAX_PENDING:
+        # Back-pressure: yield to the dispatch thread rather than grow without bound.
+        # A handler logging from the dispatch thread itself must not wait on it.
+        thread = _dispatch_thread
+        if thread is not threading.current_thread():
+            while items.qsize() >= _DISPATCH_MAX_PENDING and thread is not None and thread.is_alive():
+                time.sleep(0.001)
+    with _dispatch_lock:
+        items = _dispatch_queue
+        if items is None:
+            items = _start_dispatcher()
+        items.put((handlers, record))
+
+
+def _wait_for_dispatcher(timeout: Optional[float] = None):
+    """Block until every record queued before this call has been emitted."""
+    done = threading.Event()
+    with _dispatch_lock:
+        items = _dispatch_queue
+        if items is None:
+            return
+        items.put((None, done))
+    done.wait(timeout)
+
+
+def shutdown_dispatcher(timeout: Optional[float] = None):
+    """Emit all queued records and stop the dispatch thread."""
+    global _dispatch_queue, _dispatch_thread
+    with _dispatch_lock:
+        items, thread = _dispatch_queue, _dispatch_thread
+        _dispatch_queue = _dispatch_thread = None
+        if items is not None:
+            items.put(None)
+    if items is not None:
+        thread.join(timeout)
@@ -0,0 +1,98 @@
+"""
+File handlers that append to a memory-mapped log file.
+
+Records are copied straight into the mapping, so emitting one needs no
+write() syscall; the kernel writes the pages back on its own schedule.
+"""
+
+import mmap
+import os
+
+from .handlers import FileHandler, RotatingFileHandler
+
+
+class _MmapWriter:
+    """File-like writer that copies encoded text into a growing memory mapping."""
+
+    def __init__(self, filename, mode, encoding, chunk_size):
+        flags = os.O_RDWR | os.O_CREAT | (0 if 'a' in mode else os.O_TRUNC)
+        self._fd = os.open(filename, flags, 0o644)
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+        # Appending starts after the existing content
+        self._pos = os.fstat(self._fd).st_size
+        self._size = self._grown_size(self._pos)
+        os.ftruncate(self._fd, self._size)
+        self._map = mmap.mmap(self._fd, self._size)
+
+    def _grown_size(self, needed):
+        """Get the mapping size for at least needed bytes, rounded up to whole chunks."""
+        return (needed // self._chunk_size + 1) * self._chunk_size
+
+    def write(self, text):
+        """Copy text into the mapping, growing the file when it does not fit."""
+        data = text.encode(self._encoding)
+        end = self._pos + len(data)
+        if end > self._size:
+            self._size = self._grown_size(end)
+            # Extends the file as well as the mapping
+            self._map.resize(self._size)
+        self._map[self._pos:end] = data
+        self._pos = end
+        return len(text)
+
+    def fileno(self):
+        """Return the underlying file descriptor."""
+        return self._fd
+
+    def tell(self):
+        """Return the size of the written content."""
+        return self._pos
+
+    def flush(self):
+        """Nothing to do; written data is already in the page cache."""
+        pass
+
+    def sync(self):
+        """Wait until the mapped pages are stored on disk."""
+        self._map.flush()
+
+    def close(self):
+        """Unmap the file and cut off the unused space at its end."""
+        if self._fd is not None:
+            try:
+                self._map.close()
+                os.ftruncate(self._fd, self._pos)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+
+class MmapFileHandler(FileHandler):
+    """FileHandler that writes records into a memory mapping of the log file.
+
+    The file is grown chunk_size bytes at a time and trimmed to its content on
+    close. If the process dies first, the file ends in zero bytes up to the
+    next chunk boundary. There is no write buffer, so FileHandler's
+    buffer_size does not apply; fsync_on_error syncs the mapping instead.
+    """
+
+    def __init__(self, filename, mode='a', encoding='utf-8',
+                 flush_interval=30.0, fsync_on_error=True, chunk_size=1024*1024):
+        super().__init__(filename, mode, encoding, flush_interval=flush_interval,
+                         fsync_on_error=fsync_on_error)
+        self.chunk_size = chunk_size
+
+    def _open_file(self):
+        """Map the log file for appending."""
+        if self._file is None:
+            self._file = _MmapWriter(self.filename, self.mode, self.encoding, self.chunk_size)
+            self._write = self._file.write
+
+    def _sync(self):
+        """Wait until the mapped records are stored on disk."""
+        self._file.sync()
+
+
+class MmapRotatingFileHandler(RotatingFileHandler, MmapFileHandler):
+    """RotatingFileHandler that writes into a memory-mapped file."""
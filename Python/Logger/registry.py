@@ -2,15 +2,26 @@
 Logger registry for managing singleton logger instances.
 """
 
+import atexit
+import contextvars
+import sys
 from typing import Dict, Optional
-from .logger import Logger
+from .logger import Logger, shutdown_dispatcher
+
+
+# Registered loggers by name. Module-level so get_logger is a single dict lookup.
+_LOGGERS: Dict[str, Logger] = {}
+# close_all_loggers() runs at exit once the first logger is registered
+_atexit_registered = False
+# Logger returned by current_logger(), per thread and asyncio task
+_current_logger: contextvars.ContextVar = contextvars.ContextVar('current_logger', default=None)
 
 
 class LoggerRegistry:
     """Registry for managing singleton logger instances."""
     
-    def __init__(self):
-        self._loggers: Dict[str, Logger] = {}
+    def __init__(self, loggers: Optional[Dict[str, Logger]] = None):
+        self._loggers: Dict[str, Logger] = {} if loggers is None else loggers
     
     def get_logger(self, name: str) -> Optional[Logger]:
         """Get an existing logger by name."""
@@ -18,12 +29,14 @@ class LoggerRegistry:
     
     def register_logger(self, name: str, logger: Logger) -> None:
         """Register a logger instance."""
-        self._loggers[name] = logger
+        self._loggers[sys.intern(name)] = logger
     
     def close_logger(self, name: str) -> bool:
         """Close all handlers for a logger and remove it from registry."""
         if name in self._loggers:
             logger = self._loggers[name]
+            # Write out anything still buffered before closing
+            logger.flush()
             # Close all handlers
             for handler in logger.handlers:
                 if hasattr(handler, 'close'):
@@ -35,6 +48,8 @@ class LoggerRegistry:
     
     def close_all(self) -> None:
         """Close all registered loggers."""
+        # Emit records still queued for background dispatch first
+        shutdown_dispatcher()
         for name in list(self._loggers.keys()):
             self.close_logger(name)
     
@@ -43,18 +58,38 @@ class LoggerRegistry:
         return self._loggers.copy()
 
 
-# Global registry instance
-_registry = LoggerRegistry()
+# Global registry instance, a facade over _LOGGERS
+_registry = LoggerRegistry(_LOGGERS)
 
 
 def get_logger(name: str) -> Optional[Logger]:
     """Get a logger instance by name from the registry."""
-    return _registry.get_logger(name)
+    return _LOGGERS.get(name)
+
+
+def set_current_logger(logger: Optional[Logger]) -> None:
+    """Make logger the one current_logger() returns in this context."""
+    _current_logger.set(logger)
+
+
+def current_logger() -> Optional[Logger]:
+    """
+    Get the logger set with set_current_logger(), without a lookup by name.
+    
+    New threads start with an empty context, so code they run sees None
+    unless it runs in a copy of the setting thread's context.
+    """
+    return _current_logger.get()
 
 
 def register_logger(name: str, logger: Logger) -> None:
     """Register a logger instance in the registry."""
-    _registry.register_logger(name, logger)
+    global _atexit_registered
+    # Interned names let lookups with literal names match by identity
+    _LOGGERS[sys.intern(name)] = logger
+    if not _atexit_registered:
+        atexit.register(close_all_loggers)
+        _atexit_registered = True
 
 
 def close_logger(name: str) -> bool:
@@ -43,6 +43,8 @@ setup(
         "optional": [
             "colorama",  # For better color support on Windows
             "rich",      # For rich text formatting
+            "orjson",    # For faster JSONFormatter output
+            "liburing",  # For io_uring file writes on Linux
         ],
     },
     entry_points={
@@ -22,26 +22,36 @@ It covers all formatters, handlers, log levels, and advanced usage patterns.
 
 import sys
 import os
+import json
 import time
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from Logger import (
     LogLevel,
+    WARNING,
+    ERROR,
     get_logger,
     close_all_loggers,
-    create_logger
+    create_logger,
+    set_current_logger,
+    current_logger
 )
 from Logger.config import (
     setup_development_logger,
     setup_production_logger,
     setup_json_logger,
     setup_rotating_logger,
+    setup_async_logger,
     setup_multi_handler_logger
 )
 from Logger.logger import Logger
 from Logger.formatters import SimpleFormatter, JSONFormatter, ColoredFormatter, TemplateFormatter
-from Logger.handlers import ConsoleHandler, FileHandler, RotatingFileHandler, MemoryHandler
+from Logger.handlers import (
+    ConsoleHandler, FileHandler, RotatingFileHandler, TimedRotatingFileHandler, MemoryHandler, NullHandler
+)
+from Logger.async_handler import AsyncHandler
+from Logger.mmap_handler import MmapFileHandler
 
 print('🚀 === Python Logger Library - Comprehensive Example & Test ===\n')
 
@@ -121,6 +131,15 @@ def test_json_logger():
         'response_time': 1500,
         'error': 'Database connection timeout'
     })
+    
+    # Values orjson rejects are still written, the same way with or without it
+    memory_handler = MemoryHandler()
+    json_logger.add_handler(memory_handler)
+    json_logger.info('Unusual values', extra={'big': 2**70, 'by_id': {1: 'a'}})
+    json_logger.remove_handler(memory_handler)
+    data = json.loads(JSONFormatter().format(memory_handler.get_records()[0]))
+    if data['big'] != 2**70 or data['by_id'] != {'1': 'a'}:
+        raise ValueError(f'JSON output lost values: {data}')
 
 # Test 5: Rotating Logger
 def test_rotating_logger():
@@ -134,6 +153,15 @@ def test_rotating_logger():
             'timestamp': datetime.now().isoformat(),
             'data': 'x' * 20  # Add some data to fill the file faster
         })
+    
+    # Timed rotation takes datetimes or epoch seconds, and follows last_rotation
+    timed_handler = TimedRotatingFileHandler('timed-test.log', when='hour')
+    if timed_handler.should_rotate(datetime.now()) or timed_handler.should_rotate(time.time()):
+        raise ValueError('Timed handler wants to rotate right after it was created')
+    timed_handler.last_rotation = datetime.now() - timedelta(hours=2)
+    if not timed_handler.should_rotate(datetime.now()):
+        raise ValueError('Setting last_rotation did not reschedule the rotation')
+    timed_handler.close()
 
 # Test 6: Multi-Handler Logger
 def test_multi_handler_logger():
@@ -165,6 +193,12 @@ def test_logger_registry():
     non_existent = get_logger('non-existent')
     if non_existent is not None:
         raise ValueError('Non-existent logger should return None')
+    
+    # The current logger is shared without a lookup by name
+    set_current_logger(logger1)
+    if current_logger() is not logger1:
+        raise ValueError('current_logger did not return the logger that was set')
+    set_current_logger(None)
 
 # Test 8: Child Loggers
 def test_child_loggers():
@@ -184,6 +218,13 @@ def test_child_loggers():
     child1_again = parent_logger.get_child('child1')
     if child1 is not child1_again:
         raise ValueError('Child logger caching failed')
+    
+    # Handlers added to the parent later reach existing children, once each
+    memory_handler = MemoryHandler()
+    parent_logger.add_handler(memory_handler)
+    grandchild.info('Grandchild message after adding a parent handler')
+    if len(memory_handler.get_records()) != 1:
+        raise ValueError('Child loggers should reach parent handlers exactly once')
 
 # Test 9: Log Levels
 def test_log_levels():
@@ -198,6 +239,24 @@ def test_log_levels():
     level_logger.warning('This warning message should appear')
     level_logger.error('This error message should appear')
     level_logger.critical('This critical message should appear')
+    
+    if level_logger.is_enabled_for(LogLevel.INFO) or not level_logger.is_enabled_for(LogLevel.ERROR):
+        raise ValueError("is_enabled_for does not match the logger level")
+    
+    # Handler levels filter on top of the logger level
+    error_handler = MemoryHandler()
+    error_handler.set_level(LogLevel.ERROR)
+    level_logger.add_handler(error_handler)
+    level_logger.warning('Not stored by the error handler')
+    level_logger.error('Stored by the error handler')
+    level_logger.remove_handler(error_handler)
+    if len(error_handler.get_records()) != 1:
+        raise ValueError("Handler level was not applied")
+    
+    # Plain int levels are accepted and stored as LogLevel members
+    int_logger = create_logger('int-level-test', ERROR)
+    if int_logger.level is not LogLevel.ERROR or int_logger.is_enabled_for(WARNING):
+        raise ValueError("Int level was not applied")
 
 # Test 10: Custom Configuration
 def test_custom_configuration():
@@ -221,17 +280,51 @@ def test_custom_configuration():
     
     custom_logger.info('Custom configured logger message')
     custom_logger.debug('Debug message with custom setup')
-    custom_logger.error('Error message with custom setup')
+    custom_logger.error('Error message with custom setup', extra={'code': 500}, retry=True)
     
     # Test memory handler
     records = memory_handler.get_records()
     if len(records) != 3:
         raise ValueError(f'Memory handler should have 3 records, got {len(records)}')
+    if records[2].extra != {'code': 500, 'retry': True}:
+        raise ValueError(f'Extra fields were not merged: {records[2].extra}')
     
     # Test record structure
     first_record = records[0]
     if not hasattr(first_record, 'name') or not hasattr(first_record, 'message') or not hasattr(first_record, 'timestamp'):
         raise ValueError('Log record structure is invalid')
+    
+    # Messages that are not strings are logged as their str()
+    custom_logger.info(42)
+    custom_logger.error(ValueError('not a string'))
+    int_record, exc_record = memory_handler.get_records()[-2:]
+    if (not SimpleFormatter().format(int_record).endswith(': 42') or
+            not ColoredFormatter().format(exc_record).endswith(': not a string')):
+        raise ValueError('Non-string messages were not converted with str()')
+    
+    # Records keep their own copy of the caller's extra dict
+    shared_extra = {'phase': 'first'}
+    custom_logger.info('Shared extra message', extra=shared_extra)
+    shared_extra['phase'] = 'second'
+    if memory_handler.get_records()[-1].extra != {'phase': 'first'}:
+        raise ValueError('Changing the extra dict altered a logged record')
+    
+    # Subclasses that keep records get their own record objects, not reused ones
+    class KeepingHandler(NullHandler):
+        def __init__(self):
+            super().__init__()
+            self.kept = []
+            
+        def emit(self, record):
+            self.kept.append(record)
+            
+    keeping_logger = Logger('keeping-test')
+    keeping_handler = KeepingHandler()
+    keeping_logger.add_handler(keeping_handler)
+    for i in range(3):
+        keeping_logger.info('Kept message %d', i)
+    if [r.get_message() for r in keeping_handler.kept] != ['Kept message 0', 'Kept message 1', 'Kept message 2']:
+        raise ValueError('Records kept by a handler subclass were reused')
 
 # Test 11: Template Formatter
 def test_template_formatter():
@@ -247,6 +340,14 @@ def test_template_formatter():
     template_logger.add_handler(handler)
     
     template_logger.info('Template formatted message', extra={'user_id': 789, 'action': 'test'})
+    
+    # Literal percent signs survive the %-template the formatter compiles to
+    memory_handler = MemoryHandler()
+    template_logger.add_handler(memory_handler)
+    template_logger.warning('50% done')
+    text = TemplateFormatter('100% {levelname} {message!r}').format(memory_handler.get_records()[0])
+    if text != "100% WARNING '50% done'":
+        raise ValueError(f'Template formatter output is wrong: {text}')
 
 # Test 12: Performance Test
 def test_performance():
@@ -304,6 +405,30 @@ def test_file_handler_operations():
     
     # This should not cause an error
     file_logger.info('Message after handler close')
+    
+    # A batch of messages is written as one block, one line per message
+    file_logger.log_many(LogLevel.INFO, ['Batch message 1', 'Batch message 2'])
+    # Error batches skip the buffer, but still land after the records before them
+    file_logger.log_many(LogLevel.ERROR, ['Batch error 1', 'Batch error 2'])
+    file_handler.close()
+    with open('file-test.log', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    if not lines[-4].endswith('Batch message 1') or not lines[-3].endswith('Batch message 2'):
+        raise ValueError('log_many did not write one line per message')
+    if not lines[-2].endswith('Batch error 1') or not lines[-1].endswith('Batch error 2'):
+        raise ValueError('log_many did not write error batches in order')
+    
+    # A small chunk size makes the memory-mapped file grow several times
+    mmap_handler = MmapFileHandler('mmap-test.log', mode='w', chunk_size=64)
+    mmap_handler.set_formatter(SimpleFormatter())
+    file_logger.add_handler(mmap_handler)
+    file_logger.info('Mapped message')
+    file_logger.log_many(LogLevel.ERROR, ['Mapped error 1', 'Mapped error 2'])
+    mmap_handler.close()
+    with open('mmap-test.log', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    if len(lines) != 4 or lines[-1] or not lines[-2].endswith('Mapped error 2'):
+        raise ValueError('MmapFileHandler did not trim the file to its records')
 
 # Test 15: Integration Test
 def test_integration():
@@ -337,6 +462,56 @@ def test_integration():
     # Application shutdown
     app_logger.info('Application shutting down', extra={'reason': 'test completion'})
 
+# Test 16: Async Dispatch
+def test_async_dispatch():
+    """Test handing records to the background dispatch thread."""
+    async_logger = Logger('async-test')
+    memory_handler = MemoryHandler(100)
+    async_logger.add_handler(memory_handler)
+    async_logger.set_async_dispatch(True)
+    
+    for i in range(50):
+        async_logger.info('Async message %d', i)
+    
+    # flush() waits until the dispatch thread has emitted every queued record
+    async_logger.flush()
+    records = memory_handler.get_records()
+    if len(records) != 50:
+        raise ValueError(f'Memory handler should have 50 records, got {len(records)}')
+    if records[-1].get_message() != 'Async message 49':
+        raise ValueError('Async records were emitted out of order')
+    
+    # log_many() batches reach emit_batch() on the dispatch thread as well
+    batches = []
+    memory_handler.emit_batch = batches.append
+    async_logger.log_many(LogLevel.INFO, ['Async batch 1', 'Async batch 2'])
+    async_logger.flush()
+    if len(batches) != 1 or len(batches[0]) != 2:
+        raise ValueError('log_many records were not emitted as one batch')
+
+# Test 17: Async Handler
+def test_async_handler():
+    """Test handing records to a background thread through AsyncHandler."""
+    async_logger = setup_async_logger('async-handler-test', 'async-handler-test.log')
+    async_logger.info('Async handler file message')
+    
+    memory_handler = MemoryHandler(100)
+    async_handler = AsyncHandler([memory_handler])
+    async_logger.add_handler(async_handler)
+    
+    for i in range(20):
+        async_logger.info('Async handler message %d', i)
+    
+    # flush() waits until the background thread has emitted every queued record
+    async_handler.flush()
+    if len(memory_handler.get_records()) != 20:
+        raise ValueError(f'Memory handler should have 20 records, got {len(memory_handler.get_records())}')
+    
+    async_handler.close()
+    async_logger.info('Message after async handler close')
+    if len(memory_handler.get_records()) != 21:
+        raise ValueError('Closed async handler should emit on the calling thread')
+
 # Run all tests
 run_test('Basic Logger Creation', test_basic_logger_creation)
 run_test('Development Logger Setup', test_development_logger)
@@ -353,6 +528,8 @@ run_test('Performance Test', test_performance)
 run_test('Error Handling', test_error_handling)
 run_test('File Handler Operations', test_file_handler_operations)
 run_test('Integration Test - Complete Workflow', test_integration)
+run_test('Async Dispatch', test_async_dispatch)
+run_test('Async Handler', test_async_handler)
 
 print('\n📊 === Test Results ===')
 print(f'Tests Passed: {test_passed}/{test_total}')
@@ -372,6 +549,7 @@ print('- multi-test.log')
 print('- multi-test-errors.log')
 print('- custom-test.json.log')
 print('- file-test.log')
+print('- mmap-test.log')
 print('- integration-test.log')
 
 # Clean up
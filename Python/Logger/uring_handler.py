@@ -0,0 +1,129 @@
+"""
+File handlers that write through io_uring on Linux.
+
+Requires the optional liburing package. Without it, or on other platforms,
+the handlers behave exactly like FileHandler and RotatingFileHandler.
+"""
+
+import os
+import platform
+
+from .handlers import FileHandler, RotatingFileHandler
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+
+URING_AVAILABLE = liburing is not None and platform.system() == 'Linux'
+
+
+class _UringWriter:
+    """File-like writer that buffers encoded text and submits it to a ring on flush."""
+
+    def __init__(self, ring, cqe, filename, mode, encoding, buffer_size):
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if 'a' in mode else os.O_TRUNC)
+        self._fd = os.open(filename, flags, 0o644)
+        self._ring = ring
+        self._cqe = cqe
+        self._encoding = encoding
+        self._buffer_size = buffer_size
+        self._pending = []
+        self._pending_bytes = 0
+        self._offset = os.fstat(self._fd).st_size
+
+    def write(self, text):
+        """Queue text for the next submission."""
+        data = text.encode(self._encoding)
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        if self._pending_bytes >= self._buffer_size:
+            self.flush()
+        return len(text)
+
+    def fileno(self):
+        """Return the underlying file descriptor."""
+        return self._fd
+
+    def tell(self):
+        """Return the file size including queued data."""
+        return self._offset + self._pending_bytes
+
+    def flush(self):
+        """Submit all queued data as one write and wait for it to complete."""
+        if not self._pending:
+            return
+        data = b''.join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        while data:
+            sqe = liburing.io_uring_get_sqe(self._ring)
+            liburing.io_uring_prep_write(sqe, self._fd, data, self._offset)
+            liburing.io_uring_submit(self._ring)
+            liburing.io_uring_wait_cqe(self._ring, self._cqe)
+            entry = self._cqe[0]
+            result = entry.res
+            liburing.io_uring_cqe_seen(self._ring, entry)
+            written = liburing.trap_error(result)
+            # Short writes are rare but possible, so resubmit the remainder
+            self._offset += written
+            data = data[written:]
+
+    def close(self):
+        """Write out queued data and close the file descriptor."""
+        if self._fd is not None:
+            try:
+                self.flush()
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+
+class UringFileHandler(FileHandler):
+    """FileHandler that submits each buffered batch of records as a single io_uring write."""
+
+    def __init__(self, filename, mode='a', encoding='utf-8',
+                 buffer_size=64*1024, flush_interval=30.0, fsync_on_error=True, queue_depth=64):
+        super().__init__(filename, mode, encoding, buffer_size, flush_interval, fsync_on_error)
+        self.queue_depth = queue_depth
+        self._ring = None
+        self._cqe = None
+        self._use_ring = URING_AVAILABLE
+
+    def _init_ring(self):
+        """Set up the ring once per handler, falling back to plain writes on failure."""
+        if self._ring is None and self._use_ring:
+            ring = liburing.Ring()
+            try:
+                liburing.io_uring_queue_init(self.queue_depth, ring)
+            except OSError:
+                # e.g. io_uring disabled by the kernel or a seccomp policy
+                self._use_ring = False
+                return
+            self._ring = ring
+            self._cqe = liburing.Cqe()
+
+    def _open_file(self):
+        """Open the log file on the ring, or as a regular file without one."""
+        if self._file is None:
+            self._init_ring()
+            if self._ring is None:
+                super()._open_file()
+                return
+            # The ring outlives rotations, only the file descriptor is reopened
+            self._file = _UringWriter(self._ring, self._cqe, self.filename, self.mode,
+                                      self.encoding, self.buffer_size)
+            self._write = self._file.write
+
+    def close(self):
+        """Close the file and tear down the ring."""
+        super().close()
+        if self._ring is not None:
+            liburing.io_uring_queue_exit(self._ring)
+            self._ring = None
+            self._cqe = None
+
+
+class UringRotatingFileHandler(RotatingFileHandler, UringFileHandler):
+    """RotatingFileHandler that writes through io_uring."""
@@ -7,127 +7,126 @@ Demonstrates all log levels: DEBUG, INFO, WARNING, ERROR, CRITICAL.
 
 import sys
 import os
-import atexit
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the Logger directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'Logger'))
+# Make the Logger package importable when this file is loaded from another directory.
+# Running it as a script already puts its directory first on the path.
+_EXAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _EXAMPLE_DIR not in sys.path:
+    sys.path.insert(0, _EXAMPLE_DIR)
 
-from Logger import create_logger, get_logger, close_all_loggers, LogLevel
+from Logger import create_logger, set_current_logger, current_logger, LogLevel
 
 # Add import for the new worker module
 import worker_module
 
-# Module 1: Database operations
-def database_operations():
-    """Simulate database operations."""
-    logger = get_logger("example")  # Get the same logger instance
-    logger.debug("Preparing to connect to database...")
-    logger.info("Starting database operations")
-    logger.warning("Using default credentials (not recommended)")
-    
-    try:
-        logger.debug("Connecting to database...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("Database connection established")
-        
-        logger.debug("Executing query...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("Query executed successfully")
-        
-        # Simulate a warning condition
-        logger.warning("Query took longer than expected")
-        
-        # Simulate a critical error
-        if True:
-            raise RuntimeError("Database corruption detected!")
-        
-    except Exception as e:
-        logger.error(f"Database operation failed: {e}")
-        logger.critical("Shutting down database operations due to error!")
-        # Don't re-raise to allow program to continue
+# Simulated work per operation, done in one sleep between its two groups of steps.
+# Set SIMULATE_WORK=0 to skip it, e.g. when timing only the logging.
+WORK_SECONDS = 0.2
+SIMULATE_WORK = os.environ.get("SIMULATE_WORK", "1") != "0"
 
-# Module 2: File operations
-def file_operations():
-    """Simulate file operations."""
-    logger = get_logger("example")  # Get the same logger instance
-    logger.debug("Preparing to open file...")
-    logger.info("Starting file operations")
+# Each operation is (tag, steps before the work, steps after it, error raised at the end,
+# failure message, critical message). A step is a (level, message) pair. The tag is
+# attached as an extra field instead of being repeated in every message.
+PHASES = (
+    # Module 1: Database operations
+    ("DB", (
+        (LogLevel.DEBUG, "Preparing to connect to database..."),
+        (LogLevel.INFO, "Starting database operations"),
+        (LogLevel.WARNING, "Using default credentials (not recommended)"),
+        (LogLevel.DEBUG, "Connecting to database..."),
+    ), (
+        (LogLevel.INFO, "Database connection established"),
+        (LogLevel.DEBUG, "Executing query..."),
+        (LogLevel.INFO, "Query executed successfully"),
+        # Simulate a warning condition
+        (LogLevel.WARNING, "Query took longer than expected"),
+    ), RuntimeError("Database corruption detected!"),
+     "Database operation failed", "Shutting down database operations due to error!"),
     
-    try:
-        logger.debug("Opening file...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("File opened successfully")
-        
-        logger.debug("Processing file content...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("File processing completed")
-        
-        # Simulate a warning
-        logger.warning("File is larger than expected")
-        
-        # Simulate an error
-        if True:
-            raise IOError("Failed to write to file!")
-        
-    except Exception as e:
-        logger.error(f"File operation failed: {e}")
-        logger.critical("File system may be corrupted!")
-        # Don't re-raise to allow program to continue
+    # Module 2: File operations
+    ("File", (
+        (LogLevel.DEBUG, "Preparing to open file..."),
+        (LogLevel.INFO, "Starting file operations"),
+        (LogLevel.DEBUG, "Opening file..."),
+    ), (
+        (LogLevel.INFO, "File opened successfully"),
+        (LogLevel.DEBUG, "Processing file content..."),
+        (LogLevel.INFO, "File processing completed"),
+        (LogLevel.WARNING, "File is larger than expected"),
+    ), IOError("Failed to write to file!"),
+     "File operation failed", "File system may be corrupted!"),
+    
+    # Module 3: Network operations
+    ("Net", (
+        (LogLevel.DEBUG, "Preparing to establish network connection..."),
+        (LogLevel.INFO, "Starting network operations"),
+        (LogLevel.DEBUG, "Establishing network connection..."),
+    ), (
+        (LogLevel.INFO, "Network connection established"),
+        (LogLevel.DEBUG, "Sending data..."),
+        (LogLevel.INFO, "Data sent successfully"),
+        (LogLevel.WARNING, "Network latency is high"),
+    ), TimeoutError("Network timeout occurred!"),
+     "Network operation failed", "Network is down!"),
+)
 
-# Module 3: Network operations
-def network_operations():
-    """Simulate network operations."""
-    logger = get_logger("example")  # Get the same logger instance
-    logger.debug("Preparing to establish network connection...")
-    logger.info("Starting network operations")
+def run_phase(logger, tag, before_work, after_work, error, failure_message, critical_message):
+    """Simulate one operation: log its steps around the work, then hit its simulated error."""
+    # Log methods and enabled flags indexed by level, looked up once per phase
+    log_methods = (logger.debug, logger.info, logger.warning, logger.error, logger.critical)
+    enabled = [logger.is_enabled_for(level) for level in LogLevel]
+    # Shared by every record of the phase; formatters render it after the message
+    tag_extra = {"tag": tag}
+    
+    def log_steps(steps):
+        for level, message in steps:
+            if enabled[level]:
+                log_methods[level](message, extra=tag_extra)
     
     try:
-        logger.debug("Establishing network connection...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("Network connection established")
-        
-        logger.debug("Sending data...")
-        time.sleep(0.1)  # Simulate work
-        logger.info("Data sent successfully")
-        
-        # Simulate a warning
-        logger.warning("Network latency is high")
+        log_steps(before_work)
+        if SIMULATE_WORK:
+            time.sleep(WORK_SECONDS)  # Simulate work
+        log_steps(after_work)
         
         # Simulate an error
-        if True:
-            raise TimeoutError("Network timeout occurred!")
+        raise error
         
     except Exception as e:
-        logger.error(f"Network operation failed: {e}")
-        logger.critical("Network is down!")
+        # Merged with its args only when a handler formats the record
+        logger.error("%s: %s", failure_message, e, extra=tag_extra)
+        logger.critical(critical_message, extra=tag_extra)
         # Don't re-raise to allow program to continue
 
 def main():
     """Main program that coordinates all operations."""
     # Initialize the logger once at the start of the program
-    logger = create_logger("example", level=LogLevel.DEBUG)
+    # Handlers run on a background thread, so logging never waits on output,
+    # and the log file is memory-mapped, so appending to it needs no syscall
+    logger = create_logger("example", level=LogLevel.DEBUG, async_=True, handler="mmap")
+    # Every module reaches the same instance through current_logger(), without a name lookup
+    set_current_logger(logger)
     
     logger.info("=== Starting Multi-Module Application ===")
     
-    # Run operations from different modules
-    database_operations()
-    file_operations()
-    network_operations()
+    # Run the independent operations concurrently, so their simulated work overlaps.
+    # They share one logger; lines of different operations may interleave.
+    phase_logger = current_logger()
+    with ThreadPoolExecutor(max_workers=len(PHASES)) as pool:
+        # list() waits for every operation and re-raises anything one of them raised
+        list(pool.map(lambda phase: run_phase(phase_logger, *phase), PHASES))
     
     # Call the new worker module to demonstrate logging from another file
     worker_module.do_work()
     
-    logger.info("All operations completed (with some simulated errors)")
-    logger.info("=== Multi-Module Application Finished ===")
-
-def cleanup():
-    """Cleanup function to close all loggers."""
-    print("Closing all loggers...")
-    close_all_loggers()
+    # Consecutive messages at one level go to the handlers as a single batch
+    logger.log_many(LogLevel.INFO, [
+        "All operations completed (with some simulated errors)",
+        "=== Multi-Module Application Finished ===",
+    ])
 
 if __name__ == "__main__":
-    # Register cleanup function to run at exit
-    atexit.register(cleanup)
-    
+    # The logger library closes all loggers at exit
     main() 
\ No newline at end of file
@@ -1,5 +1,5 @@
-from Logger import get_logger
+from Logger import current_logger
 
 def do_work():
-    logger = get_logger("example")
+    logger = current_logger()
     logger.info("This is a log message from worker_module.") 
\ No newline at end of file